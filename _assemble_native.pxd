@@ -0,0 +1,4 @@
+# Typed declarations for _assemble_native, the optional Cython build of assemble.py (see setup.py).
+
+cpdef int _reg_name_to_number(str reg_name) except? -1
+cpdef int _reg_spec_to_number(str text) except? -1
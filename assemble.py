@@ -1,3 +1,4 @@
+import re
 from abc import abstractmethod
 from typing import Optional
 
@@ -8,35 +9,34 @@ MachineCodeFields = dict[FieldName, FieldValue]
 
 class Field:
     @staticmethod
-    @abstractmethod
     def parse(text: str) -> MachineCodeFields:
         return {}
 
 
+# the decimal literals int() accepts, i.e. an optional sign and digits with single "_" separators
+_decimal_immediate = re.compile(r"[+-]?\d+(?:_\d+)*")
+
+
 class Imm(Field):
     @staticmethod
     def parse(text: str) -> MachineCodeFields:
         if text.startswith("0x"):
             text = text[2:]
-            if len(text) % 2 == 1:
-                text = text.zfill(len(text) + 1)
-            val = int.from_bytes(bytes.fromhex(text), byteorder="big")
+            # anything left after stripping hex digits from both ends is an invalid character
+            invalid_digits = text.strip("0123456789abcdefABCDEF")
+            assert invalid_digits == "", f"invalid hex character {invalid_digits[:1]}"
+            val = int(text, 16) if text else 0
         elif text.startswith("0b") or text.startswith("2_"):
             text = text[2:]
             text = text.replace("_", "").replace(" ", "")
             assert len(text) <= 16, f"bitstring literal {text} too long for 16-bit field"
-            val = 0
-            power = 0
-            for bit in reversed(text):
-                assert bit in ("0", "1"), f"invalid bitstring character {bit}"
-                if bit == "1":
-                    val += (2 ** power)
-                power += 1
+            # anything left after stripping 0s and 1s from both ends is an invalid character
+            invalid_bits = text.strip("01")
+            assert invalid_bits == "", f"invalid bitstring character {invalid_bits[:1]}"
+            val = int(text, 2) if text else 0
         else:
-            try:
-                val = int(text)
-            except ValueError:
-                assert False, f"Invalid immediate {text}"
+            assert _decimal_immediate.fullmatch(text), f"Invalid immediate {text}"
+            val = int(text)
             if val < 0:
                 assert val >= -(2 ** 15), f"immediate of {val} cannot fit in the field"
                 as_bytes = val.to_bytes(length=2, byteorder="big", signed=True)
@@ -44,46 +44,38 @@ class Imm(Field):
         return {"imm": val}
 
 
-def _reg_name_to_number(reg_name: str) -> int:
-    if reg_name == "at":
-        return 1
-    if reg_name == "gp":
-        return 28
-    if reg_name == "sp":
-        return 29
-    if reg_name == "fp":
-        return 30
-    if reg_name == "ra":
-        return 31
+register_numbers_by_name: dict[str, int] = {
+    "zero": 0,
+    "at": 1,
+    **{f"v{i}": 2 + i for i in range(2)},
+    **{f"a{i}": 4 + i for i in range(4)},
     # why are T registers disjoint??
-    if reg_name == "t8":
-        return 24
-    if reg_name == "t9":
-        return 25
+    **{f"t{i}": 8 + i for i in range(8)},
+    "t8": 24,
+    "t9": 25,
+    **{f"s{i}": 16 + i for i in range(8)},
+    **{f"k{i}": 26 + i for i in range(2)},
+    "gp": 28,
+    "sp": 29,
+    "fp": 30,
+    "ra": 31,
+    # numeric forms, i.e. $0 through $31
+    **{str(i): i for i in range(32)},
+}
 
-    groups = {"v": 2, "a": 4, "t": 8, "s": 16, "k": 26}
 
-    for name, start_off in groups.items():
-        if reg_name.startswith(name):
-            return start_off + int(reg_name[len(name):])
-
-    assert False, f"invalid register name {reg_name}"
+def _reg_name_to_number(reg_name: str) -> int:
+    reg_num = register_numbers_by_name.get(reg_name)
+    assert reg_num is not None, f"invalid register name {reg_name}"
+    return reg_num
 
 
 def _reg_spec_to_number(text: str) -> int:
     assert text.startswith("$"), f"Register spec {text} did not start with $"
     value = text[1:]
-
-    try:
-        int(value)
-        is_reg_num = True
-    except ValueError:
-        is_reg_num = False
-
-    if is_reg_num:
-        return int(value)
-    else:
-        return _reg_name_to_number(value)
+    if value.isdecimal():
+        value = str(int(value))  # normalize numeric forms with leading zeros, i.e. $01
+    return _reg_name_to_number(value)
 
 
 class Register(Field):
@@ -100,10 +92,13 @@ class Offset(Field):
     @classmethod
     def parse(cls, text: str):
         imm_part, sep, reg_part = text.rpartition("(")
+        imm_part = imm_part.strip()
         reg_part = reg_part[:-1]  # remove ")"
         if len(imm_part) == 0:
             imm_part = "0"
-        return {cls.register_field_name: _reg_spec_to_number(reg_part), **Imm.parse(imm_part)}
+        fields = Imm.parse(imm_part)
+        fields[cls.register_field_name] = _reg_spec_to_number(reg_part)
+        return fields
 
 
 class OffsetRs(Offset):
@@ -127,15 +122,21 @@ class Instruction:
     opcode = 0
     format: list[Field] = []
 
+    _const_word = 0
+    _fmt: tuple[Field, ...] = ()
+    _nfmt = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # fields fixed by the instruction type, shared by every encoding of it
+        cls._const_word = (cls.opcode << 26) | getattr(cls, "funct", 0)
+        cls._fmt = tuple(cls.format)
+        cls._nfmt = len(cls._fmt)
+
     @staticmethod
     def to_bytes(instr):
         return instr.to_bytes(length=4, byteorder="big")
 
-    @classmethod
-    def _base_val(cls, rs: int = 0, rt: int = 0) -> int:
-        """Generate instruction skeleton with common fields populated."""
-        return ((cls.opcode << 10) | (rs << 5) | rt) << 16
-
     @classmethod
     @abstractmethod
     def encode(cls, **kwargs) -> bytes:
@@ -148,11 +149,7 @@ class RType(Instruction):
 
     @classmethod
     def encode(cls, rs: int = 0, rt: int = 0, rd: int = 0, sh_amt: int = 0) -> bytes:
-        instr = cls._base_val(rs=rs, rt=rt)
-
-        instr |= rd << 11
-        instr |= sh_amt << 6
-        instr |= cls.funct
+        instr = cls._const_word | (rs << 21) | (rt << 16) | (rd << 11) | (sh_amt << 6)
 
         return Instruction.to_bytes(instr)
 
@@ -160,14 +157,11 @@ class RType(Instruction):
 class IType(Instruction):
     @classmethod
     def encode(cls, rs: int = 0, rt: int = 0, imm: int = 0) -> bytes:
-        instr = cls._base_val(rs=rs, rt=rt)
-        top_bytes = (instr >> 16).to_bytes(length=2, byteorder="big")
-
         assert imm <= 2 ** 16 - 1, f"immediate of {imm} cannot fit in the field"
 
-        imm_bytes = imm.to_bytes(length=2, byteorder="big", signed=False)
+        instr = cls._const_word | (rs << 21) | (rt << 16) | imm
 
-        return top_bytes + imm_bytes
+        return Instruction.to_bytes(instr)
 
 
 class Addi(IType):
@@ -267,9 +261,17 @@ class Nop(Sll):
 
 instruction_types = [Addi, Andi, Ori, Xori, Sw, Lw, Multu, Sll, Sra, Srl, Add, Sub, And, Or, Xor, Nop]
 
+instruction_types_by_name: dict[str, type[Instruction]] = {
+    instr_type.name: instr_type for instr_type in instruction_types
+}
+assert len(instruction_types_by_name) == len(instruction_types), \
+    "Internal error: multiple instruction types registered with the same name"
+
 
 nop_machine_code = b"\x00\x00\x00\x00"
 
+_operand_separator = re.compile(r"\s*,\s*")
+
 
 def assemble(source_lines: list[str], **settings) -> tuple[list[tuple[bytes, Optional[str]]], str]:
     settings.setdefault("add_nops", False)
@@ -308,7 +310,7 @@ def assemble(source_lines: list[str], **settings) -> tuple[list[tuple[bytes, Opt
     return instructions, code_text
 
 
-def assemble_line(line: str) -> (bytes, Optional[str]):
+def assemble_line(line: str) -> tuple[bytes, Optional[str]]:
     line = line.strip()
 
     if line == "":
@@ -318,40 +320,27 @@ def assemble_line(line: str) -> (bytes, Optional[str]):
 
     instr_name, _, operands = line.partition(" ")
 
-    matching_instr_types = list(filter(
-        lambda possible_type: possible_type.name == instr_name,
-        instruction_types
-    ))
-    if len(matching_instr_types) == 0:
-        assert False, f"Unknown mnemonic {instr_name}"
-    assert len(matching_instr_types) == 1, \
-        f"Internal error: multiple instruction types registered with name {instr_name}"
-    instr_type = matching_instr_types[0]
-
-    if len(instr_type.format) > 0:
-        operands = list(map(lambda s: s.strip(), operands.split(",")))
-        operands = operands[:len(instr_type.format)]
-        # remove comment from last operand (at end of line)
-        if ";" in operands[-1]:
-            comment = operands[1].partition(";")[2].strip()
-            operands[-1] = operands[-1].split(";")[0].strip()
-        else:
-            comment = None
+    instr_type = instruction_types_by_name.get(instr_name)
+    assert instr_type is not None, f"Unknown mnemonic {instr_name}"
+
+    # remove comment (at end of line)
+    operands, has_comment, comment = operands.partition(";")
+    operands = operands.strip()
+    comment = comment.strip() if has_comment else None
 
-        if len(operands) < len(instr_type.format):
+    operand_count = instr_type._nfmt
+    if operand_count > 0:
+        operands = _operand_separator.split(operands)[:operand_count]
+
+        if len(operands) < operand_count:
             assert False,\
-                f"instruction {instr_name} needs {len(instr_type.format)} operands"
+                f"instruction {instr_name} needs {operand_count} operands"
 
         parsed_operands = {}
-        for operand_parser, raw_operand in zip(instr_type.format, operands):
-            parsed_operands = {**parsed_operands, **operand_parser.parse(raw_operand)}
+        for operand_parser, raw_operand in zip(instr_type._fmt, operands):
+            parsed_operands.update(operand_parser.parse(raw_operand))
     else:
-        if ";" in operands:
-            comment = operands.partition(";")[2].strip()
-            operands = operands.partition(";")[0].strip()
-        else:
-            comment = None
-        assert operands.strip() == "", f"Did not expect operands for {instr_name}"
+        assert operands == "", f"Did not expect operands for {instr_name}"
         parsed_operands = {}
 
     encoded_instr = instr_type.encode(**parsed_operands)
@@ -359,123 +348,27 @@ def assemble_line(line: str) -> (bytes, Optional[str]):
 
 
 def machine_code_to_vhdl(machine_code: list[tuple[bytes, Optional[str]]]) -> str:
-    text = ""
-
-    for instr, src_line in machine_code:
-        instr_hex = instr.hex().upper()
-
-        text += "    " * 2
+    code_hex = b"".join(instr for instr, _ in machine_code).hex().upper()
+    lines = []
 
-        for start_idx in range(4):
-            byte = instr_hex[start_idx * 2:(start_idx + 1) * 2]
-            text += f"8ux\"{byte}\","
-            if start_idx < 3:
-                text += " "
+    for instr_idx, (_, src_line) in enumerate(machine_code):
+        instr_hex = code_hex[instr_idx * 8:(instr_idx + 1) * 8]
 
+        line = f'        8ux"{instr_hex[0:2]}", 8ux"{instr_hex[2:4]}", 8ux"{instr_hex[4:6]}", 8ux"{instr_hex[6:8]}",'
         if src_line is not None:
-            text += " -- " + src_line.strip()
-
-        text += "\n"
+            line = f"{line} -- {src_line.strip()}"
 
-    text = text[:-1]  # remove trailing newline
-
-    return text
-
-
-def machine_code_to_text(machine_code: list[tuple[bytes, Optional[str]]]) -> str:
-    lines = []
-
-    for instr, src_line in machine_code:
-        lines.append(instr.hex())
+        lines.append(line)
 
     return "\n".join(lines)
 
 
-# UI
-
-def run_ui():
-    import tkinter
-    import tkinter.messagebox
-    import traceback
-
-    root = tkinter.Tk()
-    root.title("MIPS Assembler, by Eric Reed (ejr9567@g.rit.edu)")
-
-    assembly_label = tkinter.Label(root, text="Assembly")
-    assembly_label.grid(row=1, columnspan=2)
-    assembly_box = tkinter.Text(root, height=20)
-    assembly_box.grid(row=2, column=0)
-    assembly_box_scrollbar = tkinter.Scrollbar(root, command=assembly_box.yview)
-    assembly_box_scrollbar.grid(row=2, column=1, sticky="NS")
-    assembly_box["yscrollcommand"] = assembly_box_scrollbar.set
-
-    def assemble_button_handler():
-        lines = assembly_box.get("1.0", "end").split("\n")
-
-        options = {
-            "add_nops": add_nops_var.get(),
-            "as_vhdl": as_vhdl_var.get()
-        }
-
-        try:
-            _, code_text = assemble(lines, **options)
-        except AssertionError as assertion_error:
-            code_text = "Syntax error: " + str(assertion_error)
-        except Exception:
-            code_text = "Unexpected error:\n" + traceback.format_exc()
-
-        machine_code_box.delete("1.0", "end")
-        machine_code_box.insert("1.0", code_text)
-
-    def paste_input():
-        assembly_box.delete("1.0", "end")
-        assembly_box.insert("1.0", root.clipboard_get())
-
-    def copy_output():
-        root.clipboard_clear()
-        root.clipboard_append(machine_code_box.get("1.0", "end"))
-
-    settings_frame = tkinter.Frame(root)
-
-    assemble_button = tkinter.Button(settings_frame, text="Assemble", command=assemble_button_handler)
-    assemble_button.grid(row=0, column=0)
-
-    add_nops_var = tkinter.BooleanVar(value=True)
-    with_nops_checkbutton = tkinter.Checkbutton(settings_frame, variable=add_nops_var, text="Insert NOPs")
-    with_nops_checkbutton.grid(row=1, column=0)
-
-    as_vhdl_var = tkinter.BooleanVar(value=True)
-    as_vhdl_checkbutton = tkinter.Checkbutton(settings_frame, variable=as_vhdl_var, text="As VHDL")
-    as_vhdl_checkbutton.grid(row=2, column=0)
-
-    settings_frame.grid(row=1, rowspan=2, column=2)
-
-    machine_code_label = tkinter.Label(root, text="Machine code")
-    machine_code_label.grid(row=1, column=3, columnspan=2)
-
-    machine_code_box = tkinter.Text(root, height=20)
-    machine_code_box.grid(row=2, column=3)
-    machine_code_box_scrollbar = tkinter.Scrollbar(root, command=machine_code_box.yview)
-    machine_code_box_scrollbar.grid(row=2, column=4, sticky="NS")
-    machine_code_box["yscrollcommand"] = machine_code_box_scrollbar.set
-
-    paste_button = tkinter.Button(root, text="Paste", command=paste_input)
-    paste_button.grid(row=3, column=0, columnspan=2)
-    copy_button = tkinter.Button(root, text="Copy", command=copy_output)
-    copy_button.grid(row=3, column=3, columnspan=2)
-
-    def show_about_text():
-        message = """Written by Eric Reed for CMPE-260
-Help by Orion Holt, Manuel Waisbord
-Contribute at: https://github.com/an0ndev/mips_assembler
-Happy assembling! :)"""
-        tkinter.messagebox.showinfo("About", message)
-
-    about_button = tkinter.Button(root, text="About", command=show_about_text)
-    about_button.grid(row=3, column=2)
+def machine_code_to_text(machine_code: list[tuple[bytes, Optional[str]]]) -> str:
+    code_hex = b"".join(instr for instr, _ in machine_code).hex()
 
-    root.mainloop()
+    return "\n".join(code_hex[start_idx:start_idx + 8] for start_idx in range(0, len(code_hex), 8))
 
 
 if __name__ == '__main__':
+    from ui import run_ui
     run_ui()
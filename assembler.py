@@ -0,0 +1,32 @@
+"""Picks the assembler implementation used by the bot and the UI.
+
+With MIPS_ASM_CYTHON=1 set, the optional Cython build of assemble.py
+(_assemble_native, see setup.py) is used if it has been built and is not older
+than assemble.py. Otherwise, the plain assemble.py module is used.
+"""
+
+import os
+import pathlib
+import warnings
+
+
+def _load_assembler():
+    if os.environ.get("MIPS_ASM_CYTHON") == "1":
+        try:
+            import _assemble_native
+        except ImportError:
+            warnings.warn("MIPS_ASM_CYTHON=1 but _assemble_native is not built; using assemble.py")
+        else:
+            source_path = pathlib.Path(__file__).parent / "assemble.py"
+            if pathlib.Path(_assemble_native.__file__).stat().st_mtime >= source_path.stat().st_mtime:
+                return _assemble_native
+            warnings.warn(
+                "_assemble_native is older than assemble.py; "
+                "rebuild it with `python setup.py build_ext --inplace`. Using assemble.py"
+            )
+
+    import assemble
+    return assemble
+
+
+assemble = _load_assembler().assemble
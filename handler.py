@@ -0,0 +1,51 @@
+from assembler import assemble
+
+
+import functools
+import traceback
+import io
+
+import discord
+
+
+@functools.lru_cache(maxsize=256)
+def _assemble_cached(src: tuple[str, ...], add_nops: bool, as_vhdl: bool) -> str:
+    _, code_text = assemble(list(src), add_nops=add_nops, as_vhdl=as_vhdl)
+    return code_text
+
+
+def _build_reply(src: list[str], options: tuple[str, ...]) -> tuple[tuple, dict]:
+    try:
+        code_text = _assemble_cached(tuple(src), "add_nops" in options, "as_vhdl" in options)
+        code_text_with_tags = f"```\n{code_text}\n```"
+        as_attachment = len(code_text_with_tags) > 2000
+        if not as_attachment:
+            code_text = code_text_with_tags
+    except AssertionError as assertion_error:
+        code_text = "Syntax error: " + str(assertion_error)
+        as_attachment = False
+    except Exception:
+        code_text = "Unexpected error:\n" + "```\n" + traceback.format_exc() + "```"
+        as_attachment = False
+
+    if as_attachment:
+        args = ("",)
+        kwargs = {"file": discord.File(io.BytesIO(code_text.encode()), filename="code.txt")}
+    else:
+        args = (code_text,)
+        kwargs = {}
+
+    return args, kwargs
+
+
+async def handle_asm(message):
+    lines = message.content.split("\n")
+    command = lines[0]
+    options = tuple(map(lambda opt: opt.strip(), command.partition(" ")[2].split(",")))
+    src = lines[1:]
+
+    if src[0].startswith("```") and src[-1] == "```":
+        src = src[1:-1]
+
+    args, kwargs = _build_reply(src, options)
+    await message.reply(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""Optional native build of the assembler.
+
+Compiles assemble.py in place with Cython (pure Python mode, with the typed
+declarations in _assemble_native.pxd) into the _assemble_native extension:
+
+    python setup.py build_ext --inplace
+
+The bot and the UI use the extension only when MIPS_ASM_CYTHON=1 is set and
+it is not older than assemble.py (see assembler.py); otherwise they use the
+plain Python module. If Cython is not installed, nothing is compiled.
+
+The extension is optimized for the CPU of the machine building it
+(-march=native, or /arch:AVX2 with MSVC), so it may not run on other
+machines; build it where the bot or UI runs rather than distributing it.
+"""
+
+import sys
+
+from setuptools import Extension, setup
+
+if sys.platform == "win32":
+    extra_compile_args = ["/O2", "/arch:AVX2"]
+else:
+    extra_compile_args = ["-O3", "-march=native", "-fno-wrapv"]
+
+ext_modules = []
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    pass
+else:
+    ext_modules = cythonize(
+        [Extension("_assemble_native", ["assemble.py"], extra_compile_args=extra_compile_args)],
+        language_level=3,
+    )
+
+setup(
+    name="mips_assembler",
+    py_modules=["assemble", "assembler", "ui"],
+    ext_modules=ext_modules,
+)
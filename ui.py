@@ -0,0 +1,89 @@
+import tkinter
+import tkinter.messagebox
+import traceback
+
+from assembler import assemble
+
+
+def run_ui():
+    root = tkinter.Tk()
+    root.title("MIPS Assembler, by Eric Reed (ejr9567@g.rit.edu)")
+
+    assembly_label = tkinter.Label(root, text="Assembly")
+    assembly_label.grid(row=1, columnspan=2)
+    assembly_box = tkinter.Text(root, height=20)
+    assembly_box.grid(row=2, column=0)
+    assembly_box_scrollbar = tkinter.Scrollbar(root, command=assembly_box.yview)
+    assembly_box_scrollbar.grid(row=2, column=1, sticky="NS")
+    assembly_box["yscrollcommand"] = assembly_box_scrollbar.set
+
+    def assemble_button_handler():
+        lines = assembly_box.get("1.0", "end").split("\n")
+
+        options = {
+            "add_nops": add_nops_var.get(),
+            "as_vhdl": as_vhdl_var.get()
+        }
+
+        try:
+            _, code_text = assemble(lines, **options)
+        except AssertionError as assertion_error:
+            code_text = "Syntax error: " + str(assertion_error)
+        except Exception:
+            code_text = "Unexpected error:\n" + traceback.format_exc()
+
+        machine_code_box.delete("1.0", "end")
+        machine_code_box.insert("1.0", code_text)
+
+    def paste_input():
+        assembly_box.delete("1.0", "end")
+        assembly_box.insert("1.0", root.clipboard_get())
+
+    def copy_output():
+        root.clipboard_clear()
+        root.clipboard_append(machine_code_box.get("1.0", "end"))
+
+    settings_frame = tkinter.Frame(root)
+
+    assemble_button = tkinter.Button(settings_frame, text="Assemble", command=assemble_button_handler)
+    assemble_button.grid(row=0, column=0)
+
+    add_nops_var = tkinter.BooleanVar(value=True)
+    with_nops_checkbutton = tkinter.Checkbutton(settings_frame, variable=add_nops_var, text="Insert NOPs")
+    with_nops_checkbutton.grid(row=1, column=0)
+
+    as_vhdl_var = tkinter.BooleanVar(value=True)
+    as_vhdl_checkbutton = tkinter.Checkbutton(settings_frame, variable=as_vhdl_var, text="As VHDL")
+    as_vhdl_checkbutton.grid(row=2, column=0)
+
+    settings_frame.grid(row=1, rowspan=2, column=2)
+
+    machine_code_label = tkinter.Label(root, text="Machine code")
+    machine_code_label.grid(row=1, column=3, columnspan=2)
+
+    machine_code_box = tkinter.Text(root, height=20)
+    machine_code_box.grid(row=2, column=3)
+    machine_code_box_scrollbar = tkinter.Scrollbar(root, command=machine_code_box.yview)
+    machine_code_box_scrollbar.grid(row=2, column=4, sticky="NS")
+    machine_code_box["yscrollcommand"] = machine_code_box_scrollbar.set
+
+    paste_button = tkinter.Button(root, text="Paste", command=paste_input)
+    paste_button.grid(row=3, column=0, columnspan=2)
+    copy_button = tkinter.Button(root, text="Copy", command=copy_output)
+    copy_button.grid(row=3, column=3, columnspan=2)
+
+    def show_about_text():
+        message = """Written by Eric Reed for CMPE-260
+Help by Orion Holt, Manuel Waisbord
+Contribute at: https://github.com/an0ndev/mips_assembler
+Happy assembling! :)"""
+        tkinter.messagebox.showinfo("About", message)
+
+    about_button = tkinter.Button(root, text="About", command=show_about_text)
+    about_button.grid(row=3, column=2)
+
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    run_ui()